@@ -1,11 +1,23 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 import pandas as pd
-import io
 import numpy as np
 from typing import List, Dict
 from pydantic import BaseModel
 import datetime
+import os
+
+try:
+    import bottleneck as bn
+except ImportError:  # optional accelerator; fall back to pandas ffill
+    bn = None
+
+try:
+    import python_calamine  # noqa: F401  (Rust workbook reader behind pandas' "calamine" engine)
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None  # pandas' default (openpyxl / xlrd)
 
 app = FastAPI(title="WQ Dashboard API")
 
@@ -27,6 +39,14 @@ DEFAULT_THRESHOLDS = {
     "Iron": {"max": 0.3},
     # add more as needed
 }
+# Opt-in list of columns that get a full time-series in /analyze, e.g.
+# ANALYZE_SERIES_PARAMETERS="pH,Turbidity,DO". Unset (the default) keeps every
+# numeric column as a series; when set, the other numeric columns are only
+# summarised (min/max/mean) under "untracked".
+_series_env = os.getenv("ANALYZE_SERIES_PARAMETERS")
+SERIES_PARAMETERS = (
+    [name.strip() for name in _series_env.split(",") if name.strip()] if _series_env else None
+)
 
 class AnalysisResult(BaseModel):
     parameter: str
@@ -35,7 +55,16 @@ class AnalysisResult(BaseModel):
     exceeded: bool
     threshold: Dict
 
-@app.post("/analyze")
+class AnalysisSummary(BaseModel):
+    parameters: List[AnalysisResult]
+    alerts: List[Dict]
+    n_rows: int
+    time_column: str
+    untracked: Dict[str, Dict[str, float]] = {}
+
+# response_model lets FastAPI serialise straight to JSON bytes via pydantic-core
+# instead of jsonable_encoder + json.dumps over the long value arrays
+@app.post("/analyze", response_model=AnalysisSummary)
 async def analyze_csv(file: UploadFile = File(...)):
     """
     Accepts CSV/XLSX file with at least a timestamp column and parameter columns.
@@ -45,14 +74,31 @@ async def analyze_csv(file: UploadFile = File(...)):
     Returns JSON with time-series per parameter and simple alerts.
     Stateless - no data is persisted to database.
     """
-    contents = await file.read()
+    # pandas parsing/analysis is CPU-bound; keep it off the event loop
+    return await run_in_threadpool(_analyze_stream, file.file)
+
+
+def _read_excel(stream) -> pd.DataFrame:
+    """Read a workbook with calamine when installed, retrying with pandas' default engine."""
+    if EXCEL_ENGINE is None:
+        return pd.read_excel(stream)
+    try:
+        return pd.read_excel(stream, engine=EXCEL_ENGINE)
+    except Exception:
+        stream.seek(0)
+        return pd.read_excel(stream)
+
+
+def _analyze_stream(stream) -> dict:
+    # parse straight from the spooled upload instead of copying it into memory
     try:
         # try to infer CSV first
-        df = pd.read_csv(io.BytesIO(contents))
+        df = pd.read_csv(stream)
     except Exception:
         try:
             # fallback to Excel
-            df = pd.read_excel(io.BytesIO(contents))
+            stream.seek(0)
+            df = _read_excel(stream)
         except Exception as exc:
             raise HTTPException(status_code=400, detail=f"Could not parse uploaded file: {exc}")
 
@@ -64,9 +110,14 @@ async def analyze_csv(file: UploadFile = File(...)):
         # try first column if it looks like dates
         tcol = df.columns[0]
 
-    # coerce to datetime
+    # coerce to datetime (ISO-8601 fast path first, then pandas' format inference);
+    # Excel dates already arrive typed and are left alone
     try:
-        df[tcol] = pd.to_datetime(df[tcol])
+        if not pd.api.types.is_datetime64_any_dtype(df[tcol]):
+            try:
+                df[tcol] = pd.to_datetime(df[tcol], format="ISO8601")
+            except (ValueError, TypeError):
+                df[tcol] = pd.to_datetime(df[tcol])
     except Exception:
         # if conversion fails, create synthetic sequential times
         df[tcol] = pd.date_range(end=pd.Timestamp.now(), periods=len(df))
@@ -76,23 +127,36 @@ async def analyze_csv(file: UploadFile = File(...)):
 
     # choose numeric columns as parameters (excluding timestamp)
     numeric_cols = [c for c in df.columns if c!=tcol and pd.api.types.is_numeric_dtype(df[c])]
+    # with an opt-in list, only those columns get full time-series and the rest
+    # are summarised with one vectorised min/max/mean pass
+    if SERIES_PARAMETERS is None:
+        tracked, untracked = numeric_cols, []
+    else:
+        tracked = [c for c in numeric_cols if c in SERIES_PARAMETERS]
+        untracked = [c for c in numeric_cols if c not in SERIES_PARAMETERS]
 
     results = []
     alerts = []
+    # format the shared time axis once rather than per parameter
+    times = df[tcol].dt.strftime("%Y-%m-%d %H:%M:%S").tolist() if tracked else []
 
-    for param in numeric_cols:
+    for param in tracked:
         # Forward fill missing values, then fill remaining NaN with 0
         # Note: fillna(method='ffill') is deprecated in newer pandas, use ffill() instead
-        vals = df[param].ffill().fillna(0).astype(float).tolist()
-        times = df[tcol].dt.strftime("%Y-%m-%d %H:%M:%S").tolist()
+        if bn is not None:
+            arr = np.nan_to_num(bn.push(df[param].to_numpy(dtype=float)), nan=0.0)
+        else:
+            arr = df[param].ffill().fillna(0).to_numpy(dtype=float)
         thr = DEFAULT_THRESHOLDS.get(param, {})
         exceeded = False
 
-        # simple threshold checks
-        if 'max' in thr and any(v > thr['max'] for v in vals):
-            exceeded = True
-        if 'min' in thr and any(v < thr['min'] for v in vals):
-            exceeded = True
+        # simple threshold checks (vectorised reductions instead of per-value Python loops)
+        if arr.size:
+            if 'max' in thr and arr.max() > thr['max']:
+                exceeded = True
+            if 'min' in thr and arr.min() < thr['min']:
+                exceeded = True
+        vals = arr.tolist()
 
         if exceeded:
             alerts.append({"parameter": param, "threshold": thr})
@@ -109,10 +173,22 @@ async def analyze_csv(file: UploadFile = File(...)):
         "parameters": results,
         "alerts": alerts,
         "n_rows": len(df),
-        "time_column": tcol
+        "time_column": tcol,
+        "untracked": _summarise_untracked(df, untracked),
     }
     return summary
 
+
+def _summarise_untracked(df: pd.DataFrame, columns: list) -> Dict[str, Dict[str, float]]:
+    """min/max/mean per column, keyed by str(column); NaN stats (all-empty columns) are dropped."""
+    if not columns:
+        return {}
+    stats = df[columns].agg(["min", "max", "mean"])
+    return {
+        str(column): {stat: float(value) for stat, value in values.items() if pd.notna(value)}
+        for column, values in stats.to_dict().items()
+    }
+
 @app.get("/health")
 def health():
     """Health check endpoint"""
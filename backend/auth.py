@@ -1,8 +1,10 @@
 # backend/app/auth_utils.py
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from jose import jwt
+from functools import lru_cache
+import jwt
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -28,9 +30,18 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+@lru_cache(maxsize=4096)
+def _decode_verified(token: str) -> dict:
+    # only successful decodes are cached; invalid tokens raise and are re-checked every time
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
 def decode_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = _decode_verified(token)
     except Exception:
         return None
+    # the signature check is cached, so expiry has to be re-checked on every call
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        return None
+    return dict(payload)
@@ -1,26 +1,65 @@
 # backend/app/main.py
-from collections import deque
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
 from uuid import uuid4
+from typing import BinaryIO, NamedTuple
+import hashlib
 import io
+import json
+import logging
 import os
-import random
+import tempfile
+import threading
+import zlib
 
 import pandas as pd
-import pdfplumber
 import re
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
 import numpy as np
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.shapes import Drawing
+from reportlab.lib import colors as rl_colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import KeepTogether, PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from xml.sax.saxutils import escape
 from fastapi import FastAPI, HTTPException, Depends, UploadFile, File
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
+try:
+    import bottleneck as bn
+except ImportError:  # optional accelerator; fall back to pandas fills
+    bn = None
+
+try:
+    import pyarrow  # noqa: F401  (enables pandas' multithreaded CSV engine)
+    CSV_ENGINE = "pyarrow"
+    # Arrow-backed strings run str.replace in Arrow's C++ regex kernel
+    TEXT_DTYPE = "string[pyarrow]"
+except ImportError:
+    CSV_ENGINE = "c"
+    TEXT_DTYPE = "string[python]"
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is the fallback for report history
+    orjson = None
+
+try:
+    import python_calamine  # noqa: F401  (Rust workbook reader behind pandas' "calamine" engine)
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None  # pandas' default (openpyxl / xlrd)
+
 load_dotenv()
 
 import models
@@ -33,6 +72,7 @@ from auth import (
     decode_token,
 )
 from ml_service import get_ml_insights, predict_pollution, forecast_trend
+from pdf_tables import extract_text, iter_page_tables
 from pathlib import Path
 
 ML_DIR = Path(__file__).resolve().parent.parent / "ml"
@@ -54,6 +94,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+logger = logging.getLogger(__name__)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 # --- Analytics configuration -------------------------------------------------
@@ -106,6 +148,43 @@ PARAMETERS = {
     },
 }
 
+
+class ParameterConfig(NamedTuple):
+    key: str
+    label: str
+    unit: str
+    min: float | None
+    max: float | None
+    directive: str | None
+
+
+# PARAMETERS compiled once into immutable records for the per-upload loop
+PARAMETER_CONFIGS: tuple[ParameterConfig, ...] = tuple(
+    ParameterConfig(
+        key=key,
+        label=config["label"],
+        unit=config["unit"],
+        min=config.get("min"),
+        max=config.get("max"),
+        directive=config.get("directive"),
+    )
+    for key, config in PARAMETERS.items()
+)
+
+# Threshold limits aligned with PARAMETER_CONFIGS; a missing bound is +/-inf so
+# the comparisons in _classify_parameters need no per-parameter None checks.
+PARAMETER_LIMITS = np.array(
+    [
+        [
+            -np.inf if config.min is None else config.min,
+            np.inf if config.max is None else config.max,
+        ]
+        for config in PARAMETER_CONFIGS
+    ],
+    dtype=float,
+)
+STATUS_LABELS = np.array(["ok", "warning", "critical"])
+
 COLUMN_ALIASES = {
     "ph": "ph",
     "potentialofhydrogen": "ph",
@@ -130,7 +209,78 @@ COLUMN_ALIASES = {
     "cl2": "chlorine",
 }
 
-REPORT_HISTORY: deque[dict] = deque(maxlen=25)
+# Substring keywords used when no column slug resolves through COLUMN_ALIASES.
+# Ordered tuples: earlier keywords take precedence.
+PARAMETER_KEYWORDS = {
+    "bod": ("bod", "b.o.d", "biochemical"),
+    "cod": ("cod", "chemical"),
+    "do": ("do", "dissolved", "d.o."),
+    "ph": ("ph",),
+    "tds": ("tds", "total dissolved"),
+    "turbidity": ("turbidity", "ntu"),
+    "chlorine": ("chlorine", "freechlorine", "cl2"),
+}
+
+class ReportStore:
+    """Recent reports, newest first, indexed by id.
+
+    Entries keep only the small metadata fields in the clear; the heavy
+    sections (timeseries, parameters, ...) are held as zlib-compressed JSON so
+    history RAM scales with compressed size. Once downloaded, a report's
+    rendered PDF is kept alongside and evicted with it.
+    """
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        # oldest first, so eviction is popitem(last=False)
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._pdfs: dict[str, bytes] = {}
+
+    def appendleft(self, entry: dict) -> None:
+        self._entries[entry["id"]] = entry
+        while len(self._entries) > self.maxlen:
+            evicted, _ = self._entries.popitem(last=False)
+            self._pdfs.pop(evicted, None)
+
+    def __iter__(self):
+        return reversed(self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, report_id: str) -> dict:
+        return self._entries[report_id]
+
+    def get(self, report_id: str) -> dict | None:
+        return self._entries.get(report_id)
+
+    def latest(self) -> dict | None:
+        return next(iter(self), None)
+
+    def pdf(self, report_id: str) -> bytes | None:
+        return self._pdfs.get(report_id)
+
+    def set_pdf(self, report_id: str, content: bytes) -> None:
+        # the report may have been evicted while its PDF was rendering
+        if report_id in self._entries:
+            self._pdfs[report_id] = content
+
+
+REPORT_HISTORY = ReportStore(maxlen=25)
+REPORT_METADATA_FIELDS = ("id", "uploaded_by", "created_at", "source_filename")
+
+# ML insights keyed by (content hash, extension) so analyzing a file and then
+# asking /api/ml/predict about the same file doesn't parse or score it twice
+ML_INSIGHTS_CACHE: "OrderedDict[tuple[str, str], dict]" = OrderedDict()
+ML_INSIGHTS_CACHE_SIZE = 64
+_ml_insights_lock = threading.Lock()
+
+# Parsed PDF tables by the same key: re-uploading a report skips the seconds
+# of page layout analysis. Only PDFs, whose extracted frames are small and
+# whose parsing dominates an upload; CSV/Excel re-parse about as fast as a copy.
+PDF_FRAME_CACHE: "OrderedDict[tuple[str, str], pd.DataFrame]" = OrderedDict()
+PDF_FRAME_CACHE_SIZE = 16
+_pdf_frame_lock = threading.Lock()
 
 # -----------------------------------------------------------------------------
 # Dependency
@@ -141,6 +291,24 @@ def get_db():
     finally:
         db.close()
 
+def _pack_report(report: dict) -> dict:
+    entry = {field: report.get(field) for field in REPORT_METADATA_FIELDS}
+    body = {k: v for k, v in report.items() if k not in REPORT_METADATA_FIELDS}
+    if orjson is not None:
+        # ML figures may be NumPy scalars, which stdlib json accepts as floats
+        payload = orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload = json.dumps(body).encode()
+    entry["body"] = zlib.compress(payload, 3)
+    return entry
+
+
+def _unpack_report(entry: dict) -> dict:
+    report = {field: entry[field] for field in REPORT_METADATA_FIELDS}
+    report.update((orjson or json).loads(zlib.decompress(entry["body"])))
+    return report
+
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     payload = decode_token(token)
     if not payload:
@@ -153,181 +321,297 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
+_NON_ALNUM = re.compile(r"[\W_]+")
+# deletion table for the non-alphanumeric ASCII characters
+_ASCII_NON_ALNUM = str.maketrans("", "", "".join(chr(i) for i in range(128) if not chr(i).isalnum()))
+
+
+# column names repeat across uploads of the same report format
+@lru_cache(maxsize=4096)
 def _slugify(value: str) -> str:
-    return "".join(ch for ch in value.lower() if ch.isalnum())
-
-
-def _match_parameter_column(columns: list[str], parameter_key: str) -> str | None:
-    """Match parameter columns using multiple strategies like ML code."""
-    # Strategy 1: Direct slug match
-    for column in columns:
-        slug = _slugify(str(column))
-        resolved = COLUMN_ALIASES.get(slug)
-        if resolved == parameter_key:
-            return column
-        if slug == parameter_key:
-            return column
-    
-    # Strategy 2: Keyword matching (like ML code) - more flexible
-    column_lower = {str(c).lower(): c for c in columns}
-    param_keywords = {
-        "bod": ["bod", "b.o.d", "biochemical"],
-        "cod": ["cod", "chemical"],
-        "do": ["do", "dissolved", "d.o."],
-        "ph": ["ph"],
-        "tds": ["tds", "total dissolved"],
-        "turbidity": ["turbidity", "ntu"],
-        "chlorine": ["chlorine", "freechlorine", "cl2"],
-    }
-    
-    keywords = param_keywords.get(parameter_key, [])
-    for keyword in keywords:
-        for col_lower, col_original in column_lower.items():
-            if keyword in col_lower:
-                return col_original
-    
-    return None
+    value = value.lower()
+    # str.translate is the cheapest path for plain ASCII names; [\W_] is exactly
+    # the complement of str.isalnum(), so Unicode names (e.g. "µS/cm") match too
+    if value.isascii():
+        return value.translate(_ASCII_NON_ALNUM)
+    return _NON_ALNUM.sub("", value)
+
+
+def _match_parameter_columns(columns: list[str]) -> dict[str, int]:
+    """Map each parameter key to its column's position, slugifying every column name only once."""
+    # positions rather than labels: repeated headers must not widen the selection
+    matches: dict[str, int] = {}
+    # Strategy 1: direct slug/alias match, first matching column wins
+    for position, column in enumerate(columns):
+        resolved = COLUMN_ALIASES.get(_slugify(str(column)))
+        if resolved is not None and resolved not in matches:
+            matches[resolved] = position
+
+    # Strategy 2: keyword matching (like ML code) for parameters still unmatched.
+    # All lowercased names are joined with NULs (which no keyword contains), so
+    # each keyword is one C-level str.find over every column at once; the hit
+    # offset maps back to the first column containing it.
+    column_lower: dict[str, int] = {}
+    for position, column in enumerate(columns):
+        column_lower.setdefault(str(column).lower(), position)
+    names = list(column_lower)
+    haystack = "\0".join(names)
+    starts = list(accumulate((len(name) + 1 for name in names[:-1]), initial=0))
+    for key, keywords in PARAMETER_KEYWORDS.items():
+        if key in matches:
+            continue
+        for keyword in keywords:
+            hit = haystack.find(keyword)
+            if hit != -1:
+                matches[key] = column_lower[names[bisect_right(starts, hit) - 1]]
+                break
+
+    return matches
+
+
+def _classify_parameters(indices: np.ndarray, minimums: np.ndarray, maximums: np.ndarray) -> list[str]:
+    """Vectorised ok/warning/critical status for the parameters at ``indices`` of PARAMETER_CONFIGS."""
+    low = PARAMETER_LIMITS[indices, 0]
+    high = PARAMETER_LIMITS[indices, 1]
+    codes = ((minimums < low) | (maximums > high)).astype(np.intp)
+    codes[(minimums < low * 0.8) | (maximums > high * 1.2)] = 2
+    return STATUS_LABELS[codes].tolist()
+
+
+def _upload_size(stream: BinaryIO) -> int:
+    """Return the size of a spooled upload without reading it into memory."""
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def _upload_key(stream: BinaryIO, filename: str | None) -> tuple[str, str]:
+    """Key an upload by its BLAKE2 content hash plus extension (the extension picks the parser)."""
+    stream.seek(0)
+    digest = hashlib.file_digest(stream, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+    stream.seek(0)
+    return digest, Path(filename or "").suffix.lower()
+
+
+def _cached_ml_insights(key: tuple[str, str] | None) -> dict | None:
+    if key is None:
+        return None
+    with _ml_insights_lock:
+        insights = ML_INSIGHTS_CACHE.get(key)
+        if insights is not None:
+            ML_INSIGHTS_CACHE.move_to_end(key)
+        return insights
+
+
+def _ml_insights_for(df: pd.DataFrame, key: tuple[str, str] | None) -> dict:
+    """Return get_ml_insights(df), reusing the result for an upload already scored."""
+    insights = _cached_ml_insights(key)
+    if insights is None:
+        insights = get_ml_insights(df)
+        if key is not None:
+            with _ml_insights_lock:
+                ML_INSIGHTS_CACHE[key] = insights
+                while len(ML_INSIGHTS_CACHE) > ML_INSIGHTS_CACHE_SIZE:
+                    ML_INSIGHTS_CACHE.popitem(last=False)
+    return insights
+
+
+def _fill_gaps(values: np.ndarray) -> np.ndarray:
+    """Forward-fill then back-fill missing readings down each column, using bottleneck's push when installed."""
+    if bn is None:
+        return pd.DataFrame(values).ffill().bfill().to_numpy(dtype=float)
+    arr = bn.push(values, axis=0)
+    return bn.push(arr[::-1], axis=0)[::-1]
+
+
+def _read_csv(stream: BinaryIO) -> pd.DataFrame:
+    """Read a CSV with the pyarrow engine, retrying with the C parser for files it rejects."""
+    if CSV_ENGINE == "c":
+        return pd.read_csv(stream)
+    try:
+        df = pd.read_csv(stream, engine=CSV_ENGINE)
+    except Exception:
+        # pyarrow is stricter (e.g. ragged rows); the C engine is more forgiving
+        stream.seek(0)
+        return pd.read_csv(stream)
+    if df.columns.has_duplicates:
+        # pyarrow keeps repeated headers as-is; the C engine renames them
+        # (pH, pH.1, ...), which is what column matching expects
+        stream.seek(0)
+        return pd.read_csv(stream)
+    return df
 
 
-def _load_dataframe_from_upload(contents: bytes, filename: str | None) -> pd.DataFrame:
+def _read_excel(stream: BinaryIO) -> pd.DataFrame:
+    """Read a workbook with calamine when installed, retrying with pandas' default engine."""
+    if EXCEL_ENGINE is None:
+        return pd.read_excel(stream)
+    try:
+        return pd.read_excel(stream, engine=EXCEL_ENGINE)
+    except Exception:
+        stream.seek(0)
+        return pd.read_excel(stream)
+
+
+def _cached_dataframe_from_pdf(stream: BinaryIO, key: tuple[str, str] | None) -> pd.DataFrame:
+    """Return _dataframe_from_pdf(stream), reusing the tables of a PDF already extracted."""
+    df = None
+    if key is not None:
+        with _pdf_frame_lock:
+            df = PDF_FRAME_CACHE.get(key)
+            if df is not None:
+                PDF_FRAME_CACHE.move_to_end(key)
+    if df is None:
+        df = _dataframe_from_pdf(stream)
+        if key is not None:
+            with _pdf_frame_lock:
+                PDF_FRAME_CACHE[key] = df
+                while len(PDF_FRAME_CACHE) > PDF_FRAME_CACHE_SIZE:
+                    PDF_FRAME_CACHE.popitem(last=False)
+    # callers rename and add columns in place; the cached frame stays pristine
+    return df.copy()
+
+
+def _load_dataframe_from_upload(
+    stream: BinaryIO, filename: str | None, key: tuple[str, str] | None = None
+) -> pd.DataFrame:
+    """Parse an upload straight from its spooled file so the body is never copied into a bytes object."""
     name = (filename or "").lower()
+    stream.seek(0)
     try:
         if name.endswith(".pdf"):
-            return _dataframe_from_pdf(contents)
+            return _cached_dataframe_from_pdf(stream, key)
         if name.endswith(".xlsx") or name.endswith(".xls"):
-            return pd.read_excel(io.BytesIO(contents))
+            return _read_excel(stream)
         # default to CSV
-        return pd.read_csv(io.BytesIO(contents))
+        return _read_csv(stream)
     except Exception as exc:  # pragma: no cover - surface friendly message
         raise HTTPException(status_code=400, detail=f"Unable to parse file: {exc}") from exc
 
 
-def _extract_text_from_pdf(contents: bytes) -> str:
+def _extract_text_from_pdf(stream: BinaryIO) -> str:
     """Extract all text from PDF for regex fallback parsing."""
-    text_parts = []
     try:
-        with pdfplumber.open(io.BytesIO(contents)) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
+        stream.seek(0)
+        return extract_text(stream)
     except Exception:
-        pass
-    return "\n".join(text_parts)
+        return ""
+
+
+_TEXT_VALUE = r"[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)"
+
+# Compiled once at import; each pattern captures exactly one plain decimal number.
+# Prefixes are lowercase and run against pre-lowered text, so no re.IGNORECASE.
+TEXT_PARAMETER_PATTERNS = {
+    key: [re.compile(prefix + _TEXT_VALUE) for prefix in prefixes]
+    for key, prefixes in {
+        "bod": [r"bod", r"biochemical oxygen demand"],
+        "do": [r"\bdo", r"dissolved oxygen"],
+        "cod": [r"\bcod", r"chemical oxygen demand"],
+        "ph": [r"\bph"],
+        "tds": [r"\btds", r"total dissolved solids"],
+    }.items()
+}
 
 
 def _parse_parameters_from_text(text: str) -> dict:
     """Extract water quality parameters from text using regex (fallback method)."""
-    def find_nums(patterns):
-        found = []
-        for pat in patterns:
-            for m in re.findall(pat, text, flags=re.IGNORECASE):
-                v = m[-1] if isinstance(m, tuple) else m
-                v = re.sub(r"[^\d\.\-]", "", v or "")
-                try:
-                    if v not in ("", ".", "-", "-."):
-                        found.append(float(v))
-                except ValueError:
-                    pass
-        return found
-    
+    # Patterns are scanned separately (not fused into one alternation) because
+    # their matches may overlap, e.g. "chemical oxygen demand" inside "biochemical ..."
+    text = text.lower()
     return {
-        "bod": find_nums([r"bod[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)", r"biochemical oxygen demand[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)"]),
-        "do": find_nums([r"\bdo[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)", r"dissolved oxygen[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)"]),
-        "cod": find_nums([r"\bcod[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)", r"chemical oxygen demand[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)"]),
-        "ph": find_nums([r"\bph[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)"]),
-        "tds": find_nums([r"\btds[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)", r"total dissolved solids[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)"]),
+        key: [float(value) for pattern in patterns for value in pattern.findall(text)]
+        for key, patterns in TEXT_PARAMETER_PATTERNS.items()
     }
 
 
+# kept as a pattern string: Arrow's regex kernel takes the source, not a compiled object
+_NON_NUMERIC_CHARS = r"[^0-9.\-]"
+
+
 def _coerce_to_numeric(df: pd.DataFrame) -> pd.DataFrame:
-    """Convert all columns to numeric by stripping non-numeric characters."""
-    df = df.copy()
-    for col in list(df.columns):
-        try:
-            # Convert to string, strip non-numeric chars (except decimal point and minus), convert to numeric
-            s = df[col].astype(str).str.replace(r'[^0-9\.\-]', '', regex=True)
-            s = pd.to_numeric(s, errors='coerce')
-            df[col] = s
-        except Exception:
-            # Fallback: try direct numeric coercion
-            try:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            except Exception:
-                pass
+    """Convert all columns to numeric (in place) by stripping non-numeric characters."""
+    positions = [
+        pos
+        for pos, dtype in enumerate(df.dtypes)
+        if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+    ]
+    if not positions:
+        return df
+    # Already-numeric columns are skipped; the rest are flattened column-major
+    # into one Series so the regex strip and numeric parse each run once
+    cells = df.iloc[:, positions].to_numpy(dtype=object).ravel(order="F")
+    cleaned = pd.Series(cells, dtype=object).astype(str).astype(TEXT_DTYPE).str.replace(_NON_NUMERIC_CHARS, "", regex=True)
+    numeric = pd.to_numeric(cleaned, errors="coerce").to_numpy(dtype=float, na_value=np.nan).reshape(len(df), len(positions), order="F")
+    for idx, pos in enumerate(positions):
+        df.isetitem(pos, numeric[:, idx])
     return df
 
 
-def _dataframe_from_pdf(contents: bytes) -> pd.DataFrame:
-    """Extract tables from PDF and create DataFrame with fallback to text parsing."""
-    rows: list[list[str]] = []
-    all_tables = []
+def _table_to_dataframe(table: list[list[str | None]]) -> pd.DataFrame | None:
+    """Turn one extracted pdfplumber table into a cleaned numeric DataFrame."""
+    if not table or len(table) < 2:
+        return None
+    
+    header = table[0]
+    rows_data = table[1:]
+    
+    # Clean header row - remove newlines and normalize whitespace
+    cleaned_header = []
+    for col in header:
+        if col is None:
+            cleaned_header.append(f"col_{len(cleaned_header)}")
+        else:
+            cleaned = str(col).replace("\n", " ").replace("\r", " ").strip()
+            cleaned = " ".join(cleaned.split())
+            if not cleaned:
+                cleaned = f"col_{len(cleaned_header)}"
+            cleaned_header.append(cleaned)
     
-    # Try to extract tables
+    # Clean body rows: short rows stay None-padded in a preallocated object
+    # grid instead of growing each row list one append at a time
+    n_cols = len(cleaned_header)
+    body_rows = [row for row in rows_data if any(cell is not None for cell in row)]
+    if not body_rows:
+        return None
+    body = np.full((len(body_rows), n_cols), None, dtype=object)
+    for i, row in enumerate(body_rows):
+        width = min(len(row), n_cols)
+        body[i, :width] = row[:width]
+    df = pd.DataFrame(body, columns=cleaned_header, copy=False)
+    # Coerce to numeric
+    df = _coerce_to_numeric(df)
+    # Remove empty columns and rows
+    df = df.dropna(axis=1, how='all').dropna(axis=0, how='all')
+    return None if df.empty else df
+
+
+def _dataframe_from_pdf(stream: BinaryIO) -> pd.DataFrame:
+    """Extract tables from PDF and create DataFrame with fallback to text parsing."""
+    # Convert tables page by page as they arrive (long PDFs are extracted
+    # across the pdf_tables worker pool) so raw cell lists aren't all held at once
+    dfs = []
     try:
-        with pdfplumber.open(io.BytesIO(contents)) as pdf:
-            print(f"[DEBUG] PDF has {len(pdf.pages)} pages")
-            for page_num, page in enumerate(pdf.pages):
-                try:
-                    tables = page.extract_tables()
-                    if tables:
-                        print(f"[DEBUG] Page {page_num + 1}: Found {len(tables)} tables")
-                        all_tables.extend(tables)
-                except Exception as e:
-                    print(f"[DEBUG] Page {page_num + 1}: Error extracting tables: {e}")
-                    continue
+        for page_num, tables in iter_page_tables(stream):
+            if tables:
+                print(f"[DEBUG] Page {page_num + 1}: Found {len(tables)} tables")
+            for table in tables:
+                df = _table_to_dataframe(table)
+                if df is not None:
+                    dfs.append(df)
     except Exception as e:
         print(f"[ERROR] Failed to open PDF: {e}")
         raise HTTPException(status_code=400, detail=f"Could not open PDF file: {str(e)}")
     
-    # Process all tables
-    dfs = []
-    for table in all_tables:
-        if not table or len(table) < 2:
-            continue
-        
-        header = table[0]
-        rows_data = table[1:]
-        
-        # Clean header row - remove newlines and normalize whitespace
-        cleaned_header = []
-        for col in header:
-            if col is None:
-                cleaned_header.append(f"col_{len(cleaned_header)}")
-            else:
-                cleaned = str(col).replace("\n", " ").replace("\r", " ").strip()
-                cleaned = " ".join(cleaned.split())
-                if not cleaned:
-                    cleaned = f"col_{len(cleaned_header)}"
-                cleaned_header.append(cleaned)
-        
-        # Clean body rows
-        body = []
-        for row in rows_data:
-            if any(cell is not None for cell in row):
-                # Pad row if needed
-                while len(row) < len(cleaned_header):
-                    row.append(None)
-                body.append(row[:len(cleaned_header)])
-        
-        if body:
-            df = pd.DataFrame(body, columns=cleaned_header)
-            # Coerce to numeric
-            df = _coerce_to_numeric(df)
-            # Remove empty columns and rows
-            df = df.dropna(axis=1, how='all').dropna(axis=0, how='all')
-            if not df.empty:
-                dfs.append(df)
-    
     # Combine all dataframes
     if dfs:
-        combined_df = pd.concat(dfs, ignore_index=True, sort=False)
-        # Final numeric coercion
-        combined_df = _coerce_to_numeric(combined_df)
-        return combined_df
+        # every table was coerced to float in _table_to_dataframe, and concat
+        # only adds NaN for columns a table lacks, so no second coercion pass
+        return pd.concat(dfs, ignore_index=True, sort=False)
     
     # Fallback: extract from text if no tables found
-    text = _extract_text_from_pdf(contents)
+    text = _extract_text_from_pdf(stream)
     if text:
         parsed = _parse_parameters_from_text(text)
         # Create a simple dataframe from parsed values
@@ -344,7 +628,7 @@ def _dataframe_from_pdf(contents: bytes) -> pd.DataFrame:
 
 
 def _prepare_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    """Clean the caller's column labels (mutated, no data copy) and return a new frame without all-empty rows."""
     # Clean column names: remove newlines, normalize whitespace
     cleaned_columns = []
     for col in df.columns:
@@ -362,81 +646,108 @@ def _prepare_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _build_report_payload(df: pd.DataFrame, username: str, filename: str | None) -> dict:
+def _parse_timestamps(column: pd.Series) -> pd.Series:
+    """Parse a time column, trying pandas' C ISO-8601 fast path before per-row inference."""
+    # Excel workbooks and pyarrow-parsed CSVs often arrive already typed
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column
+    try:
+        return pd.to_datetime(column, format="ISO8601")
+    except (ValueError, TypeError):
+        return pd.to_datetime(column, errors="coerce")
+
+
+def _build_report_payload(
+    df: pd.DataFrame, username: str, filename: str | None, upload_key: tuple[str, str] | None = None
+) -> dict:
     df = _prepare_dataframe(df)
     if df.empty:
         raise HTTPException(status_code=400, detail="Dataset is empty after cleaning.")
 
-    time_column = next((col for col in df.columns if str(col).strip().lower() in TIME_COLUMN_CANDIDATES), None)
+    # Scored before the time column is parsed or synthesised below, so this is
+    # the same frame /api/ml/predict scores and the shared cache entry agrees
+    ml_insights = _ml_insights_for(df, upload_key)
+
+    # one clock read and one random id per report; alert ids derive from it
+    now = datetime.utcnow()
+    report_id = uuid4().hex
+
+    # _prepare_dataframe left every name a stripped str; list them once for
+    # both the time-column scan and parameter matching
+    columns = df.columns.tolist()
+    time_column = next((col for col in columns if col.lower() in TIME_COLUMN_CANDIDATES), None)
     if time_column:
-        df[time_column] = pd.to_datetime(df[time_column], errors="coerce")
+        df[time_column] = _parse_timestamps(df[time_column])
         if df[time_column].isna().all():
             time_column = None
 
     if not time_column:
         time_column = "generated_timestamp"
-        df[time_column] = pd.date_range(end=datetime.utcnow(), periods=len(df))
+        df[time_column] = pd.date_range(end=now, periods=len(df))
     else:
         df[time_column] = df[time_column].ffill().bfill()
-        df[time_column] = df[time_column].fillna(pd.Timestamp.utcnow())
+        df[time_column] = df[time_column].fillna(pd.Timestamp(now))
 
     timestamps = df[time_column].dt.strftime("%Y-%m-%d %H:%M:%S").tolist()
 
     parameter_summaries: list[dict] = []
     parameter_series: list[dict] = []
     alerts: list[dict] = []
-    recommendations: list[str] = []
-    evaluation_time = datetime.utcnow().isoformat()
-
-    for key, config in PARAMETERS.items():
-        column = _match_parameter_column(df.columns.tolist(), key)
-        if column is None:
-            continue
-        values = pd.to_numeric(df[column], errors="coerce")
-        filled_values = values.ffill().bfill()
-        if filled_values.dropna().empty:
-            continue
-        series_points = [
-            {"timestamp": timestamps[idx], "value": round(float(val), 3)}
-            for idx, val in enumerate(filled_values)
-        ]
-
-        avg = float(filled_values.mean())
-        min_val = float(filled_values.min())
-        max_val = float(filled_values.max())
-
-        status = "ok"
-        directive = config.get("directive")
-        min_threshold = config.get("min")
-        max_threshold = config.get("max")
-
-        if min_threshold is not None and min_val < min_threshold:
-            status = "warning"
-        if max_threshold is not None and max_val > max_threshold:
-            status = "warning"
-        if (
-            (min_threshold is not None and min_val < min_threshold * 0.8)
-            or (max_threshold is not None and max_val > max_threshold * 1.2)
-        ):
-            status = "critical"
+    # insertion-ordered set: dict keys dedupe in O(1) and keep first-seen order
+    recommendations: dict[str, None] = {}
+    evaluation_time = now.isoformat()
+
+    # Pass 1: stack the matched columns into one float matrix and fill it
+    parameter_columns = _match_parameter_columns(columns)
+    candidates = [
+        (index, parameter_columns[config.key])
+        for index, config in enumerate(PARAMETER_CONFIGS)
+        if config.key in parameter_columns
+    ]
+    block = df.iloc[:, [position for _, position in candidates]]
+    # CSV/Excel numbers and coerced PDF tables are usually numeric already and
+    # convert in one block copy; only text columns go through to_numeric
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in block.dtypes):
+        block = block.apply(pd.to_numeric, errors="coerce")
+    matrix = block.to_numpy(dtype=float, na_value=np.nan)
+    filled = _fill_gaps(matrix)
+    # after the fill a column is either all-NaN or NaN-free, so plain
+    # ndarray reductions are safe and skip pandas' NaN-aware wrappers
+    keep = ~np.isnan(filled).all(axis=0)
+    filled = filled[:, keep]
+    indices = np.array([index for index, _ in candidates], dtype=np.intp)[keep]
+
+    # Pass 2: reduce and classify every matched parameter in one shot
+    averages = filled.mean(axis=0)
+    minimums = filled.min(axis=0)
+    maximums = filled.max(axis=0)
+    statuses = _classify_parameters(indices, minimums, maximums)
+    rounded = filled.round(3)
+
+    # Pass 3: build the response records
+    for position, (index, avg, min_val, max_val, status) in enumerate(zip(
+        indices.tolist(), averages.tolist(), minimums.tolist(), maximums.tolist(), statuses
+    )):
+        config = PARAMETER_CONFIGS[index]
+        directive = config.directive
 
         if status != "ok":
             alerts.append(
                 {
-                    "id": f"{key}-{uuid4().hex[:6]}",
-                    "title": f"{config['label']} out of range",
+                    "id": f"{config.key}-{report_id[:6]}",
+                    "title": f"{config.label} out of range",
                     "severity": "critical" if status == "critical" else "warning",
-                    "message": f"{config['label']} recorded {round(max_val if status!='ok' else avg, 2)} {config['unit']}",
+                    "message": f"{config.label} recorded {round(max_val if status!='ok' else avg, 2)} {config.unit}",
                     "timestamp": evaluation_time,
                 }
             )
-            if directive and directive not in recommendations:
-                recommendations.append(directive)
+            if directive:
+                recommendations.setdefault(directive)
 
         parameter_summaries.append(
             {
-                "parameter": config["label"],
-                "unit": config["unit"],
+                "parameter": config.label,
+                "unit": config.unit,
                 "average": round(avg, 3),
                 "minimum": round(min_val, 3),
                 "maximum": round(max_val, 3),
@@ -444,32 +755,33 @@ def _build_report_payload(df: pd.DataFrame, username: str, filename: str | None)
                 "directive": directive if status != "ok" else None,
             }
         )
-        parameter_series.append({"parameter": config["label"], "points": series_points})
+        # columnar series: one shared timestamp list plus a values list, not a dict per row
+        parameter_series.append(
+            {
+                "parameter": config.label,
+                "timestamps": timestamps,
+                "values": rounded[:, position].tolist(),
+            }
+        )
 
     if not parameter_summaries:
         raise HTTPException(status_code=400, detail="No recognized water-quality parameters in file.")
 
     if not recommendations:
-        recommendations.append("All monitored parameters fall within the configured guardrails.")
+        recommendations.setdefault("All monitored parameters fall within the configured guardrails.")
 
-    # Get ML insights
-    ml_insights = get_ml_insights(df)
-    
     # Merge ML recommendations with existing recommendations
-    if ml_insights.get("recommendations"):
-        for ml_rec in ml_insights["recommendations"]:
-            if ml_rec not in recommendations:
-                recommendations.append(ml_rec)
+    recommendations.update(dict.fromkeys(ml_insights.get("recommendations") or ()))
 
     return {
-        "id": uuid4().hex,
+        "id": report_id,
         "uploaded_by": username,
         "created_at": evaluation_time,
         "source_filename": filename,
         "parameters": parameter_summaries,
         "timeseries": parameter_series,
         "alerts": alerts,
-        "recommendations": recommendations,
+        "recommendations": list(recommendations),
         "ml_insights": {
             "pollution_prediction": ml_insights.get("pollution_prediction"),
             "pollution_score": ml_insights.get("pollution_score"),
@@ -512,16 +824,23 @@ def health():
     return {"status": "ok"}
 
 
+DEMO_DAYS = 30
+
+
+@lru_cache(maxsize=1)
+def _demo_dates(today: date) -> tuple[str, ...]:
+    """Date labels for the demo series; rebuilt only when the UTC day changes."""
+    return tuple((today - timedelta(days=DEMO_DAYS - 1 - idx)).isoformat() for idx in range(DEMO_DAYS))
+
+
 @app.get("/api/demo", response_model=schemas.DashboardResponse)
 def demo_snapshot(current_user: models.User = Depends(get_current_user)):
     """Return a curated snapshot used by the dashboard UI."""
     now = datetime.utcnow()
+    values = np.round(58 + 6 * np.random.random(DEMO_DAYS) + np.arange(DEMO_DAYS) * 0.3, 2).tolist()
     timeseries = [
-        {
-            "date": (now - timedelta(days=29 - idx)).strftime("%Y-%m-%d"),
-            "value": round(58 + 6 * random.random() + idx * 0.3, 2),
-        }
-        for idx in range(30)
+        {"date": day, "value": value}
+        for day, value in zip(_demo_dates(now.date()), values)
     ]
 
     sites = [
@@ -627,19 +946,23 @@ async def analyze_upload(
     current_user: models.User = Depends(get_current_user),
 ):
     try:
-        contents = await file.read()
-        if not contents:
+        size = _upload_size(file.file)
+        if not size:
             raise HTTPException(status_code=400, detail="Uploaded file is empty")
         
-        print(f"[DEBUG] Processing file: {file.filename}, size: {len(contents)} bytes")
-        df = _load_dataframe_from_upload(contents, file.filename)
+        print(f"[DEBUG] Processing file: {file.filename}, size: {size} bytes")
+        # parsing and analysis are CPU-bound; run them in the threadpool so
+        # concurrent uploads don't serialise on the event loop
+        upload_key = await run_in_threadpool(_upload_key, file.file, file.filename)
+        df = await run_in_threadpool(_load_dataframe_from_upload, file.file, file.filename, upload_key)
         print(f"[DEBUG] DataFrame shape: {df.shape}, columns: {list(df.columns)[:10]}")
         
         if df.empty:
             raise HTTPException(status_code=400, detail="No data could be extracted from the file")
         
-        report = _build_report_payload(df, current_user.username, file.filename)
-        REPORT_HISTORY.appendleft(report)
+        report = await run_in_threadpool(_build_report_payload, df, current_user.username, file.filename, upload_key)
+        # serialising and compressing a large report is CPU work too
+        REPORT_HISTORY.appendleft(await run_in_threadpool(_pack_report, report))
         return report
     except HTTPException:
         raise
@@ -650,12 +973,13 @@ async def analyze_upload(
 
 @app.get("/api/reports", response_model=list[schemas.UploadReport])
 def list_reports(current_user: models.User = Depends(get_current_user)):
-    return list(REPORT_HISTORY)
+    return [_unpack_report(entry) for entry in REPORT_HISTORY]
 
 
 @app.get("/api/reports/latest", response_model=schemas.UploadReport | None)
 def latest_report(current_user: models.User = Depends(get_current_user)):
-    return REPORT_HISTORY[0] if REPORT_HISTORY else None
+    entry = REPORT_HISTORY.latest()
+    return _unpack_report(entry) if entry else None
 
 
 @app.post("/api/ml/predict", response_model=schemas.MLInsights)
@@ -664,13 +988,14 @@ async def ml_predict(
     current_user: models.User = Depends(get_current_user),
 ):
     """Get ML predictions for uploaded water quality data"""
-    contents = await file.read()
-    df = _load_dataframe_from_upload(contents, file.filename)
-    df = _prepare_dataframe(df)
-    if df.empty:
-        raise HTTPException(status_code=400, detail="Dataset is empty after cleaning.")
-    
-    insights = get_ml_insights(df)
+    upload_key = await run_in_threadpool(_upload_key, file.file, file.filename)
+    insights = _cached_ml_insights(upload_key)
+    if insights is None:
+        df = await run_in_threadpool(_load_dataframe_from_upload, file.file, file.filename, upload_key)
+        df = _prepare_dataframe(df)
+        if df.empty:
+            raise HTTPException(status_code=400, detail="Dataset is empty after cleaning.")
+        insights = await run_in_threadpool(_ml_insights_for, df, upload_key)
     return schemas.MLInsights(
         pollution_prediction=insights.get("pollution_prediction"),
         pollution_score=insights.get("pollution_score"),
@@ -691,109 +1016,218 @@ def ml_status(current_user: models.User = Depends(get_current_user)):
     }
 
 
-def _generate_pdf_report(report: dict, df: pd.DataFrame) -> io.BytesIO:
+PDF_STYLES = getSampleStyleSheet()
+CHART_WIDTH = 16 * cm
+CHART_HEIGHT = 9 * cm
+PDF_COLORS = ["#2b83ba", "#abdda4", "#fdae61", "#d7191c", "#984ea3", "#4daf4a"]
+# styles are read-only once built, so every render shares them
+SUMMARY_TABLE_STYLE = TableStyle([
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ("LINEBELOW", (0, 0), (-1, 0), 0.75, rl_colors.black),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [rl_colors.white, rl_colors.HexColor("#f2f2f2")]),
+])
+
+
+def _histogram_chart(values: np.ndarray, color: str) -> Drawing:
+    """Pre-bin the values with NumPy and draw the counts as a bar chart."""
+    counts, edges = np.histogram(values, bins=min(25, max(10, values.size // 5)))
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT)
+    chart = VerticalBarChart()
+    chart.x, chart.y = 1.5 * cm, 1.2 * cm
+    chart.width, chart.height = CHART_WIDTH - 2 * cm, CHART_HEIGHT - 2 * cm
+    chart.data = [counts.tolist()]
+    chart.barSpacing = 0
+    chart.groupSpacing = 0
+    chart.bars[0].fillColor = rl_colors.HexColor(color)
+    chart.bars[0].strokeColor = rl_colors.black
+    chart.valueAxis.valueMin = 0
+    # label every few bins with the bin's left edge to keep the axis readable
+    step = max(1, len(counts) // 6)
+    chart.categoryAxis.categoryNames = [f"{edge:.2f}" if i % step == 0 else "" for i, edge in enumerate(edges[:-1])]
+    chart.categoryAxis.labels.fontSize = 7
+    drawing.add(chart)
+    return drawing
+
+
+# A chart is ~16 cm wide; more vertices than this only cost render time and PDF size
+TIMESERIES_MAX_POINTS = 2000
+
+
+def _decimate(x: np.ndarray, y: np.ndarray, target: int = TIMESERIES_MAX_POINTS) -> tuple[np.ndarray, np.ndarray]:
+    """Keep each bucket's min and max point (in time order) so the plotted envelope survives."""
+    if y.size <= target:
+        return x, y
+    width = -(-y.size // (target // 2))
+    buckets = -(-y.size // width)
+    padded = np.full(buckets * width, np.nan)
+    padded[:y.size] = y
+    grid = padded.reshape(buckets, width)
+    # only the tail of the last bucket is padding, so no row is all-NaN
+    offsets = np.arange(buckets) * width
+    picks = np.sort(np.stack([np.nanargmin(grid, axis=1), np.nanargmax(grid, axis=1)], axis=1), axis=1)
+    index = (picks + offsets[:, None]).ravel()
+    return x[index], y[index]
+
+
+def _timeseries_chart(timestamps: list[str], values: list[float], color: str) -> Drawing:
+    """Draw values against their timestamps (seconds since epoch on the x axis)."""
+    seconds, points = _decimate(
+        np.array(timestamps, dtype="datetime64[s]").astype(np.int64),
+        np.asarray(values, dtype=np.float64),
+    )
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT)
+    chart = LinePlot()
+    chart.x, chart.y = 1.5 * cm, 1.5 * cm
+    chart.width, chart.height = CHART_WIDTH - 2 * cm, CHART_HEIGHT - 2.3 * cm
+    chart.data = [list(zip(seconds.tolist(), points.tolist()))]
+    chart.lines[0].strokeColor = rl_colors.HexColor(color)
+    chart.lines[0].strokeWidth = 1.5
+    chart.xValueAxis.labelTextFormat = lambda value: datetime.utcfromtimestamp(value).strftime("%Y-%m-%d")
+    chart.xValueAxis.labels.angle = 30
+    chart.xValueAxis.labels.boxAnchor = "ne"
+    chart.xValueAxis.labels.fontSize = 7
+    chart.xValueAxis.maximumTicks = 6
+    drawing.add(chart)
+    return drawing
+
+
+def _generate_pdf_report(report: dict) -> bytes:
     """Generate a PDF report with visualizations from the analysis report."""
     buffer = io.BytesIO()
-    colors = ["#2b83ba", "#abdda4", "#fdae61", "#d7191c", "#984ea3", "#4daf4a"]
-    
-    with PdfPages(buffer) as pdf:
-        # Title page
-        fig, ax = plt.subplots(figsize=(8.27, 11.69))
-        ax.axis('off')
-        ax.text(0.5, 0.92, "Water Quality Analysis Report", ha='center', fontsize=20, weight='bold')
-        ax.text(0.5, 0.88, f"Source: {report.get('source_filename', 'Unknown')}", ha='center', fontsize=12)
-        ax.text(0.5, 0.85, f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}", ha='center', fontsize=10)
-        ax.text(0.5, 0.80, f"Analyzed by: {report.get('uploaded_by', 'Unknown')}", ha='center', fontsize=10)
-        
-        # Summary statistics
-        y = 0.70
-        ax.text(0.1, y, "Parameter Summary:", fontsize=14, weight='bold')
-        y -= 0.05
-        for param in report.get('parameters', [])[:10]:
-            status_icon = "✓" if param['status'] == 'ok' else "⚠" if param['status'] == 'warning' else "✗"
-            ax.text(0.1, y, f"{status_icon} {param['parameter']:<20} Avg: {param['average']:.2f} {param['unit']} "
-                   f"(Range: {param['minimum']:.2f} - {param['maximum']:.2f})", fontsize=10)
-            y -= 0.04
-        
-        # ML Insights if available
-        if report.get('ml_insights', {}).get('model_available'):
-            y -= 0.05
-            ax.text(0.1, y, "ML Predictions:", fontsize=14, weight='bold')
-            y -= 0.04
-            ml = report['ml_insights']
-            if ml.get('pollution_score') is not None:
-                ax.text(0.1, y, f"Pollution Score: {ml['pollution_score']:.1f} ({ml.get('pollution_label', 'N/A')})", fontsize=10)
-                y -= 0.04
-            if ml.get('pollution_prediction') is not None:
-                ax.text(0.1, y, f"Predicted Pollution Level: {ml['pollution_prediction']:.2f}", fontsize=10)
-                y -= 0.04
-        
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close(fig)
-        
-        # Parameter histograms
-        for i, param in enumerate(report.get('parameters', [])):
-            param_key = param['parameter'].lower()
-            # Try to find matching column in dataframe
-            matching_col = None
-            for col in df.columns:
-                if param_key in str(col).lower() or any(kw in str(col).lower() for kw in [param_key[:3], param_key]):
-                    matching_col = col
-                    break
-            
-            if matching_col is None:
-                continue
-                
-            series = pd.to_numeric(df[matching_col], errors='coerce').dropna()
-            if series.size < 3:
-                continue
-                
-            fig, ax = plt.subplots(figsize=(8.27, 5.5))
-            ax.hist(series.values, bins=min(25, max(10, series.size // 5)), 
-                   color=colors[i % len(colors)], edgecolor='k', alpha=0.7)
-            ax.set_title(f"{param['parameter']} Distribution (n={series.size})", fontsize=14, weight='bold')
-            ax.set_xlabel(f"{param['parameter']} ({param['unit']})")
-            ax.set_ylabel("Frequency")
-            ax.grid(True, alpha=0.3)
-            stats_text = f"Mean: {series.mean():.2f}\nMedian: {series.median():.2f}\nMin: {series.min():.2f}\nMax: {series.max():.2f}"
-            ax.text(0.98, 0.95, stats_text, transform=ax.transAxes, ha='right', va='top',
-                   bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5), fontsize=9)
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close(fig)
-        
-        # Timeseries plots
-        for series in report.get('timeseries', []):
-            if len(series['points']) < 2:
-                continue
-            fig, ax = plt.subplots(figsize=(8.27, 5.5))
-            points = series['points']
-            timestamps = [p['timestamp'] for p in points]
-            values = [p['value'] for p in points]
-            ax.plot(timestamps, values, marker='o', linewidth=2, markersize=4, color=colors[0])
-            ax.set_title(f"{series['parameter']} Over Time", fontsize=14, weight='bold')
-            ax.set_xlabel("Time")
-            ax.set_ylabel(f"{series['parameter']}")
-            ax.grid(True, alpha=0.3)
-            plt.xticks(rotation=45, ha='right')
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close(fig)
-        
-        # Recommendations page
-        fig, ax = plt.subplots(figsize=(8.27, 11.69))
-        ax.axis('off')
-        ax.text(0.5, 0.95, "Recommendations & Treatment Guidance", ha='center', fontsize=18, weight='bold')
-        y = 0.85
-        for rec in report.get('recommendations', []):
-            wrapped = '\n'.join([rec[i:i+80] for i in range(0, len(rec), 80)])
-            ax.text(0.1, y, f"• {wrapped}", fontsize=10, va='top')
-            y -= len(wrapped.split('\n')) * 0.03 + 0.02
-            if y < 0.1:
-                break
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close(fig)
-    
-    buffer.seek(0)
-    return buffer
+    title, heading, body = PDF_STYLES["Title"], PDF_STYLES["Heading2"], PDF_STYLES["BodyText"]
+    story = [
+        Paragraph("Water Quality Analysis Report", title),
+        Paragraph(f"Source: {escape(str(report.get('source_filename') or 'Unknown'))}", body),
+        Paragraph(f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}", body),
+        Paragraph(f"Analyzed by: {escape(str(report.get('uploaded_by', 'Unknown')))}", body),
+        Spacer(1, 0.6 * cm),
+    ]
+
+    # Summary statistics
+    parameters = report.get('parameters', [])
+    if parameters:
+        story.append(Paragraph("Parameter Summary", heading))
+        rows = [["Status", "Parameter", "Average", "Range", "Unit"]]
+        for param in parameters[:10]:
+            rows.append([
+                param['status'].upper(),
+                param['parameter'],
+                f"{param['average']:.2f}",
+                f"{param['minimum']:.2f} - {param['maximum']:.2f}",
+                param['unit'],
+            ])
+        table = Table(rows, hAlign="LEFT")
+        table.setStyle(SUMMARY_TABLE_STYLE)
+        story.append(table)
+
+    # ML Insights if available
+    ml = report.get('ml_insights', {})
+    if ml.get('model_available'):
+        story.append(Paragraph("ML Predictions", heading))
+        if ml.get('pollution_score') is not None:
+            story.append(Paragraph(f"Pollution Score: {ml['pollution_score']:.1f} ({escape(str(ml.get('pollution_label', 'N/A')))})", body))
+        if ml.get('pollution_prediction') is not None:
+            story.append(Paragraph(f"Predicted Pollution Level: {ml['pollution_prediction']:.2f}", body))
+    story.append(PageBreak())
+
+    # Parameter histograms, straight from each parameter's (gap-filled) series
+    series_values = {series['parameter']: series['values'] for series in report.get('timeseries', [])}
+    for i, param in enumerate(parameters):
+        if param['parameter'] not in series_values:
+            continue
+
+        values = np.asarray(series_values[param['parameter']], dtype=np.float64)
+        if values.size < 3:
+            continue
+
+        # mean/min/max were fixed at upload; only the median isn't in the summary
+        stats_text = (
+            f"Mean: {param['average']:.2f} &nbsp; Median: {np.median(values):.2f} &nbsp; "
+            f"Min: {param['minimum']:.2f} &nbsp; Max: {param['maximum']:.2f}"
+        )
+        story.append(KeepTogether([
+            Paragraph(f"{escape(param['parameter'])} Distribution (n={values.size})", heading),
+            Paragraph(f"{escape(param['parameter'])} ({escape(param['unit'])}) — {stats_text}", body),
+            _histogram_chart(values, PDF_COLORS[i % len(PDF_COLORS)]),
+        ]))
+
+    # Timeseries plots
+    for series in report.get('timeseries', []):
+        if len(series['values']) < 2:
+            continue
+        story.append(KeepTogether([
+            Paragraph(f"{escape(series['parameter'])} Over Time", heading),
+            _timeseries_chart(series['timestamps'], series['values'], PDF_COLORS[0]),
+        ]))
+
+    # Recommendations page
+    story.append(PageBreak())
+    story.append(Paragraph("Recommendations &amp; Treatment Guidance", title))
+    for rec in report.get('recommendations', []):
+        story.append(Paragraph(escape(rec), body, bulletText="•"))
+
+    SimpleDocTemplate(buffer, pagesize=A4, title="Water Quality Analysis Report").build(story)
+    # ReportLab only serialises the document at save time, so there are no
+    # pages to stream early; hand back the bytes and let the buffer go here
+    return buffer.getvalue()
+
+
+# Optional directory shared by every worker (and surviving restarts) for
+# rendered PDFs; unset, rendered PDFs are only cached in this process
+PDF_CACHE_DIR = Path(os.environ["PDF_CACHE_DIR"]) if os.getenv("PDF_CACHE_DIR") else None
+PDF_CACHE_MAX_FILES = 256
+# the directory scan behind pruning runs once per this many cache writes, not on every download
+PDF_CACHE_PRUNE_EVERY = 32
+_pdf_cache_writes = 0
+_pdf_cache_lock = threading.Lock()
+_REPORT_ID = re.compile(r"[0-9a-f]{32}")
+
+
+def _render_report_pdf(entry: dict) -> bytes:
+    """Decompress a history entry and render it; both steps belong off the event loop."""
+    return _generate_pdf_report(_unpack_report(entry))
+
+
+def _pdf_cache_path(report_id: str) -> Path | None:
+    # only ever build paths from well-formed ids (uuid4 hex), never raw input
+    if PDF_CACHE_DIR is None or not _REPORT_ID.fullmatch(report_id):
+        return None
+    return PDF_CACHE_DIR / f"{report_id}.pdf"
+
+
+def _write_pdf_cache(path: Path, content: bytes) -> None:
+    """Write atomically; every PDF_CACHE_PRUNE_EVERY writes, keep only the newest PDF_CACHE_MAX_FILES PDFs."""
+    global _pdf_cache_writes
+    tmp_name = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # unique temp name per write: threads rendering the same report must
+        # never share (and half-overwrite) one temp file
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False) as tmp:
+            tmp_name = tmp.name
+            tmp.write(content)
+        os.replace(tmp_name, path)
+        tmp_name = None
+        with _pdf_cache_lock:
+            _pdf_cache_writes += 1
+            prune = _pdf_cache_writes % PDF_CACHE_PRUNE_EVERY == 0
+        if prune:
+            cached = sorted(path.parent.glob("*.pdf"), key=lambda p: p.stat().st_mtime)
+            for stale in cached[:-PDF_CACHE_MAX_FILES]:
+                stale.unlink(missing_ok=True)
+    except OSError as exc:
+        # the disk cache is an optimisation; never fail the download over it
+        logger.warning("Could not cache PDF at %s: %s", path, exc)
+    finally:
+        if tmp_name is not None:
+            Path(tmp_name).unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=1)
+def _date_stamp(day: date) -> str:
+    """YYYYMMDD for download filenames; reformatted only when the UTC day changes."""
+    return day.strftime("%Y%m%d")
 
 
 @app.get("/api/reports/{report_id}/pdf")
@@ -802,33 +1236,26 @@ async def download_report_pdf(
     current_user: models.User = Depends(get_current_user),
 ):
     """Generate and download a PDF report for a specific analysis."""
-    report = next((r for r in REPORT_HISTORY if r['id'] == report_id), None)
-    if not report:
+    filename = f"water_quality_report_{report_id[:8]}_{_date_stamp(datetime.utcnow().date())}.pdf"
+    entry = REPORT_HISTORY.get(report_id)
+    # archived reports never change, so repeat downloads reuse the first render
+    pdf_bytes = REPORT_HISTORY.pdf(report_id) if entry else None
+    cache_path = _pdf_cache_path(report_id)
+    if pdf_bytes is None and cache_path is not None and cache_path.is_file():
+        # rendered by this or another worker; sent with sendfile
+        return FileResponse(cache_path, media_type="application/pdf", filename=filename)
+    if not entry:
         raise HTTPException(status_code=404, detail="Report not found")
+
+    if pdf_bytes is None:
+        # chart layout is CPU-bound; keep it off the event loop like the upload parsing
+        pdf_bytes = await run_in_threadpool(_render_report_pdf, entry)
+        REPORT_HISTORY.set_pdf(report_id, pdf_bytes)
+        if cache_path is not None:
+            await run_in_threadpool(_write_pdf_cache, cache_path, pdf_bytes)
     
-    # Reconstruct dataframe from report (simplified - in production, store the dataframe)
-    # For now, we'll create a minimal dataframe from the timeseries data
-    df_data = {}
-    for series in report.get('timeseries', []):
-        param = series['parameter']
-        if param not in df_data:
-            df_data[param] = []
-        for point in series['points']:
-            df_data[param].append(point['value'])
-    
-    # Pad to same length
-    max_len = max([len(v) for v in df_data.values()] + [1])
-    for key in df_data:
-        while len(df_data[key]) < max_len:
-            df_data[key].append(np.nan)
-    
-    df = pd.DataFrame(df_data)
-    
-    pdf_buffer = _generate_pdf_report(report, df)
-    
-    filename = f"water_quality_report_{report_id[:8]}_{datetime.utcnow().strftime('%Y%m%d')}.pdf"
-    return StreamingResponse(
-        pdf_buffer,
+    return Response(
+        content=pdf_bytes,
         media_type="application/pdf",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
@@ -839,6 +1266,7 @@ async def download_latest_report_pdf(
     current_user: models.User = Depends(get_current_user),
 ):
     """Generate and download a PDF report for the latest analysis."""
-    if not REPORT_HISTORY:
+    entry = REPORT_HISTORY.latest()
+    if not entry:
         raise HTTPException(status_code=404, detail="No reports available")
-    return await download_report_pdf(REPORT_HISTORY[0]['id'], current_user)
+    return await download_report_pdf(entry['id'], current_user)
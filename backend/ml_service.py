@@ -8,8 +8,6 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-import joblib
-from sklearn.impute import SimpleImputer
 import warnings
 warnings.filterwarnings("ignore")
 
@@ -43,6 +41,11 @@ def load_model():
         return None, None
     
     try:
+        # sklearn/joblib cost well over a second to import, so they load with
+        # the model rather than at server start (and not at all without one)
+        import joblib
+        from sklearn.impute import SimpleImputer
+
         _model = joblib.load(MODEL_PATH)
         # Create imputer (using median strategy as in training)
         _imputer = SimpleImputer(strategy="median")
@@ -62,10 +65,8 @@ def prepare_features(df: pd.DataFrame) -> Optional[np.ndarray]:
     if model is None:
         return None
     
-    # Make a copy to avoid modifying original
-    df = df.copy()
-    
-    # Keep only numeric columns
+    # Keep only numeric columns (select_dtypes returns a new frame, so the
+    # caller's frame is never modified and no defensive copy is needed)
     numeric_df = df.select_dtypes(include=[np.number])
     
     if numeric_df.shape[1] < 3:
@@ -113,19 +114,15 @@ def forecast_trend(series: pd.Series, steps: int = 3) -> Optional[List[float]]:
     Simple linear forecast for time series data.
     Returns list of forecasted values.
     """
-    from sklearn.linear_model import LinearRegression
-    
     s = series.dropna().reset_index(drop=True)
     if s.size < 3:
         return None
     
     try:
-        X = np.arange(len(s)).reshape(-1, 1)
-        y = s.values.reshape(-1, 1)
-        model = LinearRegression().fit(X, y)
-        xf = np.arange(len(s), len(s) + steps).reshape(-1, 1)
-        yf = model.predict(xf).ravel()
-        return [float(v) for v in yf]
+        # closed-form least-squares line; no estimator object to build per series
+        slope, intercept = np.polyfit(np.arange(len(s)), s.to_numpy(dtype=float), 1)
+        yf = intercept + slope * np.arange(len(s), len(s) + steps)
+        return yf.tolist()
     except Exception as e:
         print(f"Error forecasting trend: {e}")
         return None
@@ -177,25 +174,24 @@ def compute_pollution_score(values: Dict[str, List[float]]) -> Tuple[float, str]
     return float(score), label
 
 
+# Column name mappings (case-insensitive), built once rather than per call
+PARAM_MAPPINGS = {
+    "bod": ("bod", "biochemical", "b.o.d"),
+    "cod": ("cod", "chemical"),
+    "do": ("do", "dissolved oxygen", "d.o."),
+    "ph": ("ph", "ph "),
+    "tds": ("tds", "total dissolved"),
+    "turbidity": ("turbidity", "ntu"),
+    "chlorine": ("chlorine", "freechlorine", "cl2"),
+}
+
+
 def extract_parameters_from_df(df: pd.DataFrame) -> Dict[str, List[float]]:
     """
     Extract water quality parameters from dataframe.
     Returns dict with parameter names as keys and lists of values.
     """
-    # Column name mappings (case-insensitive)
-    param_mappings = {
-        "bod": ["bod", "biochemical", "b.o.d"],
-        "cod": ["cod", "chemical"],
-        "do": ["do", "dissolved oxygen", "d.o."],
-        "ph": ["ph", "ph "],
-        "tds": ["tds", "total dissolved"],
-        "turbidity": ["turbidity", "ntu"],
-        "chlorine": ["chlorine", "freechlorine", "cl2"],
-    }
-    
     extracted = {}
-    # Create a normalized copy for matching
-    df_normalized = df.copy()
     # Normalize column names: lowercase, strip, replace newlines/spaces
     normalized_cols = {}
     for col in df.columns:
@@ -203,7 +199,7 @@ def extract_parameters_from_df(df: pd.DataFrame) -> Dict[str, List[float]]:
         normalized = " ".join(normalized.split())  # Remove extra spaces
         normalized_cols[normalized] = col
     
-    for param, keywords in param_mappings.items():
+    for param, keywords in PARAM_MAPPINGS.items():
         values = []
         for normalized_col, original_col in normalized_cols.items():
             # Check if any keyword matches
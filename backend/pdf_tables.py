@@ -0,0 +1,168 @@
+"""
+PDF Table Extraction
+Runs pdfplumber table extraction page by page, fanning long PDFs out
+across a process pool so layout analysis isn't bound to a single core.
+Plain text comes from PDFium (pypdfium2) when available.
+PyMuPDF can be selected instead with PDF_ENGINE=pymupdf.
+"""
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
+from typing import BinaryIO, Iterable, Iterator
+
+import pdfplumber
+
+try:
+    import pymupdf
+except ImportError:  # optional, AGPL-licensed; pdfplumber is always available
+    pymupdf = None
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # installed with pdfplumber; fall back to its text layer
+    pdfium = None
+
+# "pdfplumber" (default) or "pymupdf". MuPDF's C parser is faster, but its
+# table detector splits some NWMP reports differently, so it is opt-in.
+PDF_ENGINE = os.getenv("PDF_ENGINE", "pdfplumber").lower()
+# PDF_WORKERS: page-extraction processes per web worker; 1 disables the pool.
+# Every uvicorn/gunicorn worker starts its own pool, so the default is kept
+# small; size it so (web workers x PDF_WORKERS) roughly matches the cores.
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", min(4, os.cpu_count() or 1)))
+# Short PDFs aren't worth shipping to another process
+PARALLEL_MIN_PAGES = 3
+
+_pool: ProcessPoolExecutor | None = None
+# uploads are parsed in the server's threadpool, so first use can race
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Create the shared worker pool on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn keeps workers independent of the server's threads. Each
+                # child imports this module plus the launching script, which
+                # spawn re-runs as __mp_main__: cheap under the uvicorn CLI,
+                # but `python main.py` would redo the app's module-level setup
+                # in every worker, so launch the API through uvicorn.
+                _pool = ProcessPoolExecutor(
+                    max_workers=PDF_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def _use_pymupdf() -> bool:
+    return PDF_ENGINE == "pymupdf" and pymupdf is not None
+
+
+@contextmanager
+def _on_disk(stream: BinaryIO) -> Iterator[str]:
+    """Yield a filesystem path holding the PDF, without reading it into memory."""
+    name = getattr(stream, "name", None)
+    # a spooled upload that has rolled over to a named file can be opened as-is
+    # (anonymous temp files report an int fd as their name)
+    if isinstance(name, str) and os.path.isfile(name):
+        stream.flush()
+        yield name
+        return
+    # otherwise stream a copy to disk; delete=False so the file can be
+    # reopened on Windows while we hold it
+    stream.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        shutil.copyfileobj(stream, tmp, 1 << 20)
+    try:
+        yield tmp.name
+    finally:
+        os.unlink(tmp.name)
+
+
+def _iter_pymupdf_tables(stream: BinaryIO) -> Iterator[tuple[int, list]]:
+    """Yield (page_number, tables) using PyMuPDF's find_tables."""
+    with _on_disk(stream) as path, pymupdf.open(path, filetype="pdf") as doc:
+        print(f"[DEBUG] PDF has {doc.page_count} pages")
+        for page in doc:
+            try:
+                tables = [table.extract() for table in page.find_tables().tables]
+            except Exception as e:
+                print(f"[DEBUG] Page {page.number + 1}: Error extracting tables: {e}")
+                tables = []
+            yield page.number, tables
+
+
+def _extract_pages(pdf, page_numbers: Iterable[int]) -> Iterator[tuple[int, list]]:
+    """Yield (page_number, tables) for each page, releasing page caches as we go."""
+    for page_num in page_numbers:
+        page = pdf.pages[page_num]
+        try:
+            tables = page.extract_tables()
+        except Exception as e:
+            print(f"[DEBUG] Page {page_num + 1}: Error extracting tables: {e}")
+            tables = []
+        finally:
+            page.close()
+        yield page_num, tables
+
+
+def _extract_batch(path: str, page_numbers: list[int]) -> list[tuple[int, list]]:
+    """Worker entry point: reopen the PDF from disk and extract one contiguous batch of pages."""
+    with pdfplumber.open(path) as pdf:
+        return list(_extract_pages(pdf, page_numbers))
+
+
+def iter_page_tables(stream: BinaryIO) -> Iterator[tuple[int, list]]:
+    """Yield (page_number, tables) for every page of the PDF, in page order."""
+    if _use_pymupdf():
+        yield from _iter_pymupdf_tables(stream)
+        return
+
+    with pdfplumber.open(stream) as pdf:
+        page_count = len(pdf.pages)
+        print(f"[DEBUG] PDF has {page_count} pages")
+        if page_count < PARALLEL_MIN_PAGES or PDF_WORKERS <= 1:
+            yield from _extract_pages(pdf, range(page_count))
+            return
+
+    batch_size = math.ceil(page_count / PDF_WORKERS)
+    batches = [list(range(start, min(start + batch_size, page_count))) for start in range(0, page_count, batch_size)]
+    # hand workers a path rather than pickling the whole PDF into every batch
+    with _on_disk(stream) as path:
+        for batch in _get_pool().map(_extract_batch, repeat(path), batches):
+            yield from batch
+
+
+def _pdfium_page_text(page) -> str:
+    textpage = page.get_textpage()
+    try:
+        return textpage.get_text_bounded()
+    finally:
+        textpage.close()
+        page.close()
+
+
+def extract_text(stream: BinaryIO) -> str:
+    """Return the text of every page, joined by newlines."""
+    if _use_pymupdf():
+        with _on_disk(stream) as path, pymupdf.open(path, filetype="pdf") as doc:
+            text_parts = [page.get_text("text") for page in doc]
+    elif pdfium is not None:
+        # PDFium's C++ text layer skips pdfminer's per-character layout
+        # analysis, which is all pdfplumber's extract_text adds on top
+        doc = pdfium.PdfDocument(stream)
+        try:
+            text_parts = [_pdfium_page_text(page) for page in doc]
+        finally:
+            doc.close()
+    else:
+        with pdfplumber.open(stream) as pdf:
+            text_parts = [page.extract_text() for page in pdf.pages]
+    return "\n".join(text for text in text_parts if text)
@@ -93,14 +93,10 @@ class DashboardResponse(BaseModel):
     mobile: MobilePayload
 
 
-class ParameterPoint(BaseModel):
-    timestamp: str
-    value: float
-
-
 class ParameterSeries(BaseModel):
     parameter: str
-    points: list[ParameterPoint]
+    timestamps: list[str]
+    values: list[float]
 
 
 class ParameterSummary(BaseModel):
@@ -8,7 +8,7 @@ import {
   Tooltip,
   CartesianGrid,
 } from "recharts";
-import type { UploadReport, ParameterSummary } from "../types/dashboard";
+import type { UploadReport, ParameterSummary, ParameterSeries, ParameterPoint } from "../types/dashboard";
 import { downloadLatestReportPdf } from "../services/api";
 
 interface UploadsProps {
@@ -23,6 +23,10 @@ const statusTone: Record<string, string> = {
   critical: "border-rose-500/30 bg-rose-500/10 text-rose-100",
 };
 
+function toChartPoints(series: ParameterSeries): ParameterPoint[] {
+  return series.timestamps.map((timestamp, idx) => ({ timestamp, value: series.values[idx] }));
+}
+
 export default function Uploads({ onUpload, uploading, reports }: UploadsProps) {
   const [error, setError] = useState<string | null>(null);
   const [previewName, setPreviewName] = useState<string | null>(null);
@@ -163,7 +167,7 @@ export default function Uploads({ onUpload, uploading, reports }: UploadsProps)
                     <p className="text-sm font-semibold text-white">{series.parameter}</p>
                     <div className="mt-3 h-48">
                       <ResponsiveContainer>
-                        <LineChart data={series.points}>
+                        <LineChart data={toChartPoints(series)}>
                           <CartesianGrid strokeDasharray="3 3" stroke="#334155" />
                           <XAxis
                             dataKey="timestamp"
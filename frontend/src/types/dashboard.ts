@@ -91,9 +91,11 @@ export interface ParameterPoint {
   value: number;
 }
 
+/** Columnar series: `values[i]` was recorded at `timestamps[i]`. */
 export interface ParameterSeries {
   parameter: string;
-  points: ParameterPoint[];
+  timestamps: string[];
+  values: number[];
 }
 
 export interface MLInsights {
@@ -12,10 +12,12 @@ import re
 import pdfplumber
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # headless: reports only go to PDF, never a window
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 from datetime import datetime, timezone
-from sklearn.linear_model import LinearRegression
+from functools import lru_cache
 import warnings
 warnings.filterwarnings("ignore", category=UserWarning)
 
@@ -26,6 +28,10 @@ DEFAULT_INPUT = Path("data/pdfs")
 DEFAULT_OUTPUT_DIR = Path("reports")
 # color palette (user requested colourful)
 PALETTE = ["#2b83ba", "#abdda4", "#fdae61", "#d7191c", "#984ea3", "#4daf4a"]
+# parameters reported on, in page order
+REPORT_PARAMS = ['bod','cod','do','ph','tds','temp','conductivity']
+# pairwise scatter pages are limited to the most strongly correlated pairs
+SCATTER_TOP_K = 6
 
 # -------------------------
 # Utilities
@@ -60,8 +66,19 @@ def extract_text(pdf_path):
             all_text.append(page.extract_text() or "")
     return "\n".join(all_text)
 
+_NON_ALNUM_RUN = re.compile(r'[^0-9a-zA-Z]+')
+_NON_NUMERIC = re.compile(r'[^0-9\.\-]')
+# loose "<name> ... <number>" patterns for the text fallback, compiled once
+TEXT_PATTERNS = {
+    'bod': re.compile(r'BOD[^\d\-\.]{0,10}([0-9]{1,5}(?:\.[0-9]+)?)', re.I),
+    'cod': re.compile(r'COD[^\d\-\.]{0,10}([0-9]{1,6}(?:\.[0-9]+)?)', re.I),
+    'do': re.compile(r'\bDO[^\d\-\.]{0,10}([0-9]{1,2}(?:\.[0-9]+)?)', re.I),
+    'ph': re.compile(r'\bPH[^\d\-\.]{0,10}([0-9]{1,2}(?:\.[0-9]+)?)', re.I),
+    'temp': re.compile(r'Temp(?:erature)?[^\d\-\.]{0,10}([0-9]{1,3}(?:\.[0-9]+)?)', re.I),
+}
+
 def normalize_colname(c):
-    return re.sub(r'[^0-9a-zA-Z]+', '_', str(c)).strip().lower()
+    return _NON_ALNUM_RUN.sub('_', str(c)).strip().lower()
 
 # heuristics to map table columns to parameter names
 PARAM_KEYS = {
@@ -74,19 +91,25 @@ PARAM_KEYS = {
     'conductivity': ['conductivity', 'ec', 'umhos', 'µmhos']
 }
 
+@lru_cache(maxsize=1024)
+def param_for_column(name):
+    """First PARAM_KEYS parameter with a keyword in the raw or normalized name, else None."""
+    cc = name.lower()
+    cc2 = normalize_colname(cc)
+    for param, keys in PARAM_KEYS.items():
+        if any(k in cc or k in cc2 for k in keys):
+            return param
+    return None
+
 def map_columns(df):
     """Rename likely parameter columns (best-effort)."""
+    # every table of a report series repeats the same headers, so each distinct
+    # header is matched once per run rather than once per table
     mapping = {}
     for c in df.columns:
-        cc = str(c).lower()
-        cc2 = normalize_colname(cc)
-        for param, keys in PARAM_KEYS.items():
-            for k in keys:
-                if (isinstance(k, str) and k in cc) or (isinstance(k, str) and k in cc2):
-                    mapping[c] = param
-                    break
-            if c in mapping:
-                break
+        param = param_for_column(str(c))
+        if param is not None:
+            mapping[c] = param
     return df.rename(columns=mapping)
 
 def coerce_params(df: pd.DataFrame) -> pd.DataFrame:
@@ -105,7 +128,7 @@ def coerce_params(df: pd.DataFrame) -> pd.DataFrame:
     for col in list(df.columns):
         try:
             # convert to str first (handles mixed types), strip currency/units/letters
-            s = df[col].astype(str).str.replace(r'[^0-9\.\-]', '', regex=True)
+            s = df[col].astype(str).str.replace(_NON_NUMERIC, '', regex=True)
             s = pd.to_numeric(s, errors='coerce')
             df[col] = s
         except Exception:
@@ -149,16 +172,8 @@ def coerce_params(df: pd.DataFrame) -> pd.DataFrame:
 def fallback_regex_parse(text):
     """Extract numbers from the text using loose regex for parameters."""
     finds = {'bod':[], 'cod':[], 'do':[], 'ph':[], 'tds':[], 'temp':[], 'conductivity':[]}
-    for m in re.finditer(r'BOD[^\d\-\.]{0,10}([0-9]{1,5}(?:\.[0-9]+)?)', text, re.I):
-        finds['bod'].append(float(m.group(1)))
-    for m in re.finditer(r'COD[^\d\-\.]{0,10}([0-9]{1,6}(?:\.[0-9]+)?)', text, re.I):
-        finds['cod'].append(float(m.group(1)))
-    for m in re.finditer(r'\bDO[^\d\-\.]{0,10}([0-9]{1,2}(?:\.[0-9]+)?)', text, re.I):
-        finds['do'].append(float(m.group(1)))
-    for m in re.finditer(r'\bPH[^\d\-\.]{0,10}([0-9]{1,2}(?:\.[0-9]+)?)', text, re.I):
-        finds['ph'].append(float(m.group(1)))
-    for m in re.finditer(r'Temp(?:erature)?[^\d\-\.]{0,10}([0-9]{1,3}(?:\.[0-9]+)?)', text, re.I):
-        finds['temp'].append(float(m.group(1)))
+    for param, pattern in TEXT_PATTERNS.items():
+        finds[param].extend(float(v) for v in pattern.findall(text))
     return finds
 
 # -------------------------
@@ -181,13 +196,12 @@ def build_combined_dataframe(pdf_files):
             text = extract_text(p)
             parsed = fallback_regex_parse(text)
             maxlen = max((len(v) for v in parsed.values()), default=0)
-            rows = []
-            for i in range(maxlen):
-                row = {k: (parsed[k][i] if i < len(parsed[k]) else np.nan) for k in parsed}
-                row['source_pdf'] = p.name
-                rows.append(row)
-            if rows:
-                df = pd.DataFrame(rows)
+            if maxlen:
+                # build columns directly, NaN-padding each list in one extend
+                # rather than assembling a dict per row
+                data = {k: v + [np.nan] * (maxlen - len(v)) for k, v in parsed.items()}
+                data['source_pdf'] = [p.name] * maxlen
+                df = pd.DataFrame(data)
                 df = coerce_params(df)
                 frames.append(df)
     if frames:
@@ -199,20 +213,18 @@ def build_combined_dataframe(pdf_files):
     return big
 
 def simple_forecast(series, steps=3):
-    """Linear forecast using sklearn LinearRegression on index -> value"""
+    """Linear least-squares forecast on index -> value"""
     s = series.dropna().reset_index(drop=True)
     if s.size < 3:
         return None
-    X = np.arange(len(s)).reshape(-1,1)
-    y = s.values.reshape(-1,1)
-    model = LinearRegression().fit(X, y)
-    xf = np.arange(len(s), len(s)+steps).reshape(-1,1)
-    yf = model.predict(xf).ravel()
-    return yf
+    slope, intercept = np.polyfit(np.arange(len(s)), s.to_numpy(dtype=float), 1)
+    return intercept + slope * np.arange(len(s), len(s)+steps)
 
 def create_pdf_report(df, pdf_paths, out_pdf_path):
     out_pdf_path.parent.mkdir(parents=True, exist_ok=True)
     ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M")
+    # each parameter's readings as one clean float array, shared by every page below
+    param_arr = {p: pd.to_numeric(df[p], errors='coerce').dropna().to_numpy(dtype=float) for p in REPORT_PARAMS if p in df.columns}
     with PdfPages(out_pdf_path) as pdf:
         # Title page
         fig, ax = plt.subplots(figsize=(8.27, 11.69))
@@ -221,11 +233,11 @@ def create_pdf_report(df, pdf_paths, out_pdf_path):
         ax.text(0.5, 0.88, f"Files analyzed: {len(pdf_paths)}", ha='center', fontsize=10)
         ax.text(0.5, 0.85, f"Generated: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}", ha='center', fontsize=9)
         y = 0.75
-        for param in ['bod','cod','do','ph','tds','temp','conductivity']:
-            if param in df.columns:
-                s = pd.to_numeric(df[param], errors='coerce').dropna()
+        for param in REPORT_PARAMS:
+            if param in param_arr:
+                s = param_arr[param]
                 if s.size>0:
-                    ax.text(0.02, y, f"{param.upper():<12} n={s.size:<5} mean={s.mean():.2f}  median={s.median():.2f}  min={s.min():.2f}  max={s.max():.2f}", fontsize=10)
+                    ax.text(0.02, y, f"{param.upper():<12} n={s.size:<5} mean={s.mean():.2f}  median={np.median(s):.2f}  min={s.min():.2f}  max={s.max():.2f}", fontsize=10)
                 else:
                     ax.text(0.02, y, f"{param.upper():<12} no data", fontsize=10)
             else:
@@ -236,36 +248,43 @@ def create_pdf_report(df, pdf_paths, out_pdf_path):
 
         # Per-parameter histograms
         colors = PALETTE
-        for i, param in enumerate(['bod','cod','do','ph','tds','temp','conductivity']):
-            if param in df.columns:
-                s = pd.to_numeric(df[param], errors='coerce').dropna()
+        for i, param in enumerate(REPORT_PARAMS):
+            if param in param_arr:
+                s = param_arr[param]
                 if s.size == 0:
                     continue
                 fig, ax = plt.subplots(figsize=(8.27,5.5))
-                ax.hist(s.values, bins=25, color=colors[i % len(colors)], edgecolor='k', alpha=0.9)
+                counts, edges = np.histogram(s, bins=25)
+                # one filled step patch instead of a Rectangle per bin
+                ax.stairs(counts, edges, fill=True, color=colors[i % len(colors)], edgecolor='k', alpha=0.9)
                 ax.set_title(f"{param.upper()} distribution — n={s.size}", fontsize=14)
                 ax.set_xlabel(param.upper())
                 ax.set_ylabel("count")
                 ax.grid(True, alpha=0.25)
-                ax.text(0.98, 0.95, f"mean={s.mean():.2f}\nmedian={s.median():.2f}\nmin={s.min():.2f}\nmax={s.max():.2f}", transform=ax.transAxes, ha='right', va='top', bbox=dict(alpha=0.1))
+                ax.text(0.98, 0.95, f"mean={s.mean():.2f}\nmedian={np.median(s):.2f}\nmin={s.min():.2f}\nmax={s.max():.2f}", transform=ax.transAxes, ha='right', va='top', bbox=dict(alpha=0.1))
                 pdf.savefig(fig, bbox_inches='tight')
                 plt.close(fig)
 
         # Pairwise scatter for parameters (if enough data)
-        numeric_params = [p for p in ['bod','cod','do','ph','tds','temp','conductivity'] if p in df.columns and pd.to_numeric(df[p], errors='coerce').dropna().size >= 10]
-        for i in range(len(numeric_params)):
-            for j in range(i+1, len(numeric_params)):
-                a = numeric_params[i]; b = numeric_params[j]
-                sub = df[[a,b]].apply(pd.to_numeric, errors='coerce').dropna()
-                if sub.shape[0] < 8:
-                    continue
-                fig, ax = plt.subplots(figsize=(8.27,5.5))
-                ax.scatter(sub[a], sub[b], c=colors[(i+j) % len(colors)], alpha=0.8)
-                ax.set_xlabel(a.upper()); ax.set_ylabel(b.upper())
-                ax.set_title(f"{a.upper()} vs {b.upper()} (n={sub.shape[0]})")
-                ax.grid(True, alpha=0.25)
-                pdf.savefig(fig, bbox_inches='tight')
-                plt.close(fig)
+        numeric_params = [p for p in REPORT_PARAMS if p in param_arr and param_arr[p].size >= 10]
+        # only plot the SCATTER_TOP_K most correlated pairs (by |Pearson r| over
+        # rows where both are present) instead of every one of the n*(n-1)/2
+        num = df[numeric_params].apply(pd.to_numeric, errors='coerce')
+        present = num.notna().to_numpy(dtype=np.int64)
+        pair_counts = present.T @ present
+        strength = num.corr(min_periods=8).abs().fillna(-1).to_numpy()
+        pairs = [(i, j) for i, j in zip(*np.triu_indices(len(numeric_params), 1)) if pair_counts[i, j] >= 8]
+        pairs.sort(key=lambda ij: -strength[ij])
+        for i, j in pairs[:SCATTER_TOP_K]:
+            a = numeric_params[i]; b = numeric_params[j]
+            sub = num[[a,b]].dropna()
+            fig, ax = plt.subplots(figsize=(8.27,5.5))
+            ax.scatter(sub[a], sub[b], c=colors[(i+j) % len(colors)], alpha=0.8)
+            ax.set_xlabel(a.upper()); ax.set_ylabel(b.upper())
+            ax.set_title(f"{a.upper()} vs {b.upper()} (n={sub.shape[0]})")
+            ax.grid(True, alpha=0.25)
+            pdf.savefig(fig, bbox_inches='tight')
+            plt.close(fig)
 
         # Timeseries by year if source_pdf contains year
         if 'source_pdf' in df.columns:
@@ -299,11 +318,11 @@ def create_pdf_report(df, pdf_paths, out_pdf_path):
 
         # Conclusions & prioritized actions
         summary_text = []
-        if 'bod' in df.columns and pd.to_numeric(df['bod'], errors='coerce').dropna().size > 0 and pd.to_numeric(df['bod'], errors='coerce').mean() > 3:
+        if 'bod' in param_arr and param_arr['bod'].size > 0 and param_arr['bod'].mean() > 3:
             summary_text.append("Elevated BOD (organic load) — prioritize biological treatment upgrades and aeration.")
-        if 'do' in df.columns and pd.to_numeric(df['do'], errors='coerce').dropna().size > 0 and pd.to_numeric(df['do'], errors='coerce').mean() < 5:
+        if 'do' in param_arr and param_arr['do'].size > 0 and param_arr['do'].mean() < 5:
             summary_text.append("Low DO — increase aeration and reduce upstream organic discharges.")
-        if 'cod' in df.columns and pd.to_numeric(df['cod'], errors='coerce').dropna().size > 0 and pd.to_numeric(df['cod'], errors='coerce').mean() > 50:
+        if 'cod' in param_arr and param_arr['cod'].size > 0 and param_arr['cod'].mean() > 50:
             summary_text.append("High COD — investigate industrial effluents; consider AOP for hard-to-destroy organics.")
         if not summary_text:
             summary_text.append("No immediate red flags detected by automated heuristics; inspect raw tables or provide Excel/CSV for best results.")
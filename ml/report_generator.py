@@ -15,6 +15,8 @@ from pathlib import Path
 import pdfplumber
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # headless: reports only go to PDF, never a window
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 from datetime import datetime
@@ -28,14 +30,25 @@ TEXT_DIR.mkdir(parents=True, exist_ok=True)
 REPORT_DIR.mkdir(parents=True, exist_ok=True)
 
 # ---------- Helpers: parsing ----------
+_NUMBER = r"[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)"
+# compiled once at import rather than looked up in re's cache per call
+TEXT_PATTERNS = {
+    "bod": [re.compile(r"bod" + _NUMBER, re.I), re.compile(r"biochemical oxygen demand" + _NUMBER, re.I)],
+    "do": [re.compile(r"\bdo" + _NUMBER, re.I), re.compile(r"dissolved oxygen" + _NUMBER, re.I)],
+    "cod": [re.compile(r"\bcod" + _NUMBER, re.I), re.compile(r"chemical oxygen demand" + _NUMBER, re.I)],
+    "ph": [re.compile(r"\bph" + _NUMBER, re.I)],
+    "tds": [re.compile(r"\btds" + _NUMBER, re.I), re.compile(r"total dissolved solids" + _NUMBER, re.I)],
+}
+_NON_NUMERIC = re.compile(r"[^\d\.\-]")
+
 def parse_numbers_from_text(text: str):
     """Return numeric lists for common water params found in free-form text."""
     def find_nums(patterns):
         found = []
         for pat in patterns:
-            for m in re.findall(pat, text, flags=re.IGNORECASE):
+            for m in pat.findall(text):
                 v = m[-1] if isinstance(m, tuple) else m
-                v = re.sub(r"[^\d\.\-]", "", v or "")
+                v = _NON_NUMERIC.sub("", v or "")
                 try:
                     if v not in ("", ".", "-", "-."):
                         found.append(float(v))
@@ -43,11 +56,11 @@ def parse_numbers_from_text(text: str):
                     pass
         return found
 
-    bod = find_nums([r"bod[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)", r"biochemical oxygen demand[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)"])
-    do  = find_nums([r"\bdo[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)", r"dissolved oxygen[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)"])
-    cod = find_nums([r"\bcod[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)", r"chemical oxygen demand[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)"])
-    ph  = find_nums([r"\bph[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)"])
-    tds = find_nums([r"\btds[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)", r"total dissolved solids[^\d\-\.]{0,6}([0-9]+(?:\.[0-9]+)?)"])
+    bod = find_nums(TEXT_PATTERNS["bod"])
+    do  = find_nums(TEXT_PATTERNS["do"])
+    cod = find_nums(TEXT_PATTERNS["cod"])
+    ph  = find_nums(TEXT_PATTERNS["ph"])
+    tds = find_nums(TEXT_PATTERNS["tds"])
     return {"bod": bod, "do": do, "cod": cod, "ph": ph, "tds": tds}
 
 def extract_tables_from_pdf(pdf_path: Path):
@@ -147,7 +160,10 @@ def recommended_treatments(stats: dict):
 def plot_hist(series, title, ax=None):
     if ax is None:
         ax = plt.gca()
-    ax.hist(series.dropna(), bins=20)
+    # bin with NumPy and draw the outline as a single filled step patch, rather
+    # than the Rectangle per bin that ax.hist / ax.bar create
+    counts, edges = np.histogram(series.dropna().to_numpy(dtype=float), bins=20)
+    ax.stairs(counts, edges, fill=True)
     ax.set_title(title)
     ax.set_xlabel("Value")
     ax.set_ylabel("Count")